@@ -0,0 +1,271 @@
+// cdp.js - Minimal Chrome DevTools Protocol client for the oldmbp.lnet Chrome instance.
+// Talks to the DevTools HTTP endpoints and page WebSockets directly, without puppeteer.
+
+import { mkdirSync, readFileSync, rmSync, writeFileSync } from "node:fs";
+import http from "node:http";
+import { homedir } from "node:os";
+import { join } from "node:path";
+import WebSocket from "ws";
+
+export const OLDMBP_IP = "192.168.2.4";
+export const DEVTOOLS_URL = `http://${OLDMBP_IP}:9222`;
+
+const TIMEOUT = 5000;
+
+// Keep DevTools HTTP connections alive so consecutive requests reuse a socket.
+// maxSockets also caps how many requests run in parallel, e.g. in closeTabs().
+const agent = new http.Agent({ keepAlive: true, maxSockets: 8 });
+
+// Errors meaning a pooled socket went stale (e.g. Chrome restarted) before it was
+// reused. Only requests sent on a reused socket are retried: on a fresh socket
+// the error may come after Chrome acted on the request (e.g. opened a tab).
+const STALE_SOCKET = new Set(["ECONNRESET", "EPIPE"]);
+
+function request(method, path) {
+	return new Promise((resolve, reject) => {
+		const req = http.request(`${DEVTOOLS_URL}${path}`, { method, agent, timeout: TIMEOUT }, (res) => {
+			let body = "";
+			res.setEncoding("utf8");
+			res.on("data", (chunk) => (body += chunk));
+			res.on("end", () => {
+				if (res.statusCode >= 400) {
+					reject(new Error(`HTTP ${res.statusCode}: ${body.trim()}`));
+					return;
+				}
+				try {
+					resolve(JSON.parse(body));
+				} catch {
+					resolve(body);
+				}
+			});
+		});
+		req.on("timeout", () => req.destroy(new Error("timeout")));
+		req.on("error", (e) => {
+			e.reusedSocket = req.reusedSocket;
+			reject(e);
+		});
+		req.end();
+	});
+}
+
+export async function devtools(path, method = "GET") {
+	try {
+		return await request(method, path);
+	} catch (e) {
+		if (!e.reusedSocket || !STALE_SOCKET.has(e.code)) throw e;
+		return request(method, path);
+	}
+}
+
+// /json/list is fetched and parsed once and reused for a moment, so several
+// lookups in one run cost one request. Filtered views are kept per type.
+const TARGETS_TTL = 250;
+let targetsCache = null;
+
+// The last list is also kept on disk for a couple of seconds, so back-to-back
+// invocations (e.g. several oldmbp-eval.js calls in a row) skip the request too
+const SNAPSHOT_DIR = join(homedir(), ".cache", "oldmbp-chrome");
+const SNAPSHOT_FILE = join(SNAPSHOT_DIR, "targets.json");
+const SNAPSHOT_TTL = 2000;
+
+// Keep only the fields the tools use. Every target then has the same small,
+// fixed shape, and the cached list and on-disk snapshot stay compact.
+function toTarget({ id, type, title, url, webSocketDebuggerUrl }) {
+	return { id, type, title, url, webSocketDebuggerUrl };
+}
+
+function readSnapshot() {
+	try {
+		const { at, targets } = JSON.parse(readFileSync(SNAPSHOT_FILE, "utf8"));
+		if (Date.now() - at < SNAPSHOT_TTL) return targets;
+	} catch {}
+	return null;
+}
+
+function writeSnapshot(targets) {
+	try {
+		mkdirSync(SNAPSHOT_DIR, { recursive: true });
+		writeFileSync(SNAPSHOT_FILE, JSON.stringify({ at: Date.now(), targets }));
+	} catch {}
+	return targets;
+}
+
+export function listTargets({ type } = {}) {
+	if (!targetsCache || performance.now() - targetsCache.at >= TARGETS_TTL) {
+		const snapshot = readSnapshot();
+		const targets = snapshot
+			? Promise.resolve(snapshot)
+			: devtools("/json/list")
+					.then((list) => list.map(toTarget))
+					.then(writeSnapshot);
+		targetsCache = { at: performance.now(), targets, byType: new Map() };
+		targets.catch(() => {
+			if (targetsCache?.targets === targets) invalidateTargets();
+		});
+	}
+	if (!type) return targetsCache.targets;
+	let filtered = targetsCache.byType.get(type);
+	if (!filtered) {
+		filtered = targetsCache.targets.then((targets) => targets.filter((t) => t.type === type));
+		targetsCache.byType.set(type, filtered);
+	}
+	return filtered;
+}
+
+// Drop cached lists; call after anything that opens, closes or navigates tabs,
+// or when a cached target turns out to be gone
+export function invalidateTargets() {
+	targetsCache = null;
+	rmSync(SNAPSHOT_FILE, { force: true });
+}
+
+// The current tab for every tool: Chrome lists targets most recently active first
+export async function activeTab() {
+	return (await listTargets({ type: "page" }))[0];
+}
+
+// The activeTab() page of a puppeteer browser, so the puppeteer-based tools act
+// on the same tab as oldmbp-eval.js and oldmbp-tabs.js
+export async function activePage(browser, retry = true) {
+	const [tab, pages] = await Promise.all([activeTab(), browser.pages()]);
+	if (!tab) return undefined;
+	const ids = await Promise.all(
+		pages.map(async (page) => {
+			const session = await page.createCDPSession();
+			const { targetInfo } = await session.send("Target.getTargetInfo");
+			await session.detach();
+			return targetInfo.targetId;
+		}),
+	);
+	const page = pages[ids.indexOf(tab.id)];
+	if (page || !retry) return page;
+	// The cached list named a tab that is gone; look again with a fresh list
+	invalidateTargets();
+	return activePage(browser, false);
+}
+
+// Connect to activeTab() (or a tab it already returned). That tab may come from
+// a snapshot up to two seconds old; if it is gone, look again with a fresh list
+// and connect once more. Resolves with the tab actually connected to.
+export async function connectActiveTab(tab) {
+	tab ??= await activeTab();
+	if (!tab) throw new Error("No active tab found");
+	try {
+		return { tab, client: await connect(tab.webSocketDebuggerUrl) };
+	} catch {
+		invalidateTargets();
+		const fresh = await activeTab();
+		if (!fresh) throw new Error("No active tab found");
+		return { tab: fresh, client: await connect(fresh.webSocketDebuggerUrl) };
+	}
+}
+
+export function pageWebSocketUrl(id) {
+	return `ws://${OLDMBP_IP}:9222/devtools/page/${id}`;
+}
+
+// Tab operations are bodyless PUTs on the keep-alive connection. Each one
+// changes the tab list or its order, so cached lists are dropped around it.
+function changeTabs(path) {
+	invalidateTargets();
+	return devtools(path, "PUT").finally(invalidateTargets);
+}
+
+export function openTab(url) {
+	return changeTabs(`/json/new?${encodeURIComponent(url)}`);
+}
+
+export function activateTab(id) {
+	return changeTabs(`/json/activate/${id}`);
+}
+
+export function closeTab(id) {
+	return changeTabs(`/json/close/${id}`);
+}
+
+// Close tabs concurrently; each close is independent, so this takes about one round trip
+export function closeTabs(ids) {
+	return Promise.allSettled(ids.map(closeTab));
+}
+
+class CDPClient {
+	#ws;
+	#nextId = 0;
+	#pending = new Map();
+
+	constructor(ws) {
+		this.#ws = ws;
+		ws.on("message", (data) => {
+			const msg = JSON.parse(data);
+			const pending = this.#pending.get(msg.id);
+			if (!pending) return; // protocol event, nothing is waiting on it
+			this.#pending.delete(msg.id);
+			if (msg.error) pending.reject(new Error(msg.error.message));
+			else pending.resolve(msg.result);
+		});
+		// Errors are always followed by "close", which fails whatever is pending
+		ws.on("error", () => {});
+		ws.on("close", () => {
+			for (const { reject } of this.#pending.values()) reject(new Error("Connection closed"));
+			this.#pending.clear();
+		});
+	}
+
+	get open() {
+		return this.#ws.readyState === WebSocket.OPEN;
+	}
+
+	// Send one message, built by frame(id), and resolve with its result
+	#call(frame) {
+		return new Promise((resolve, reject) => {
+			const id = ++this.#nextId;
+			this.#pending.set(id, { resolve, reject });
+			this.#ws.send(frame(id));
+		});
+	}
+
+	send(method, params = {}) {
+		return this.#call((id) => JSON.stringify({ id, method, params }));
+	}
+
+	// Evaluate an expression in the page and return its value, awaiting promises.
+	// The message is filled into a fixed template rather than serialized from an object.
+	async evaluate(expression) {
+		const expr = JSON.stringify(`(async () => (${expression}))()`);
+		const { result, exceptionDetails } = await this.#call(
+			(id) => `{"id":${id},"method":"Runtime.evaluate","params":{"expression":${expr},"returnByValue":true,"awaitPromise":true}}`,
+		);
+		if (exceptionDetails) {
+			throw new Error(exceptionDetails.exception?.description ?? exceptionDetails.text);
+		}
+		// NaN, ±Infinity, -0 and BigInts can't be returned by value; Chrome sends
+		// them as strings such as "NaN", "-0" or "10n" instead
+		if ("unserializableValue" in result) {
+			const raw = result.unserializableValue;
+			return raw.endsWith("n") ? BigInt(raw.slice(0, -1)) : Number(raw);
+		}
+		return result.value;
+	}
+
+	close() {
+		this.#ws.close();
+	}
+}
+
+export function connect(wsUrl) {
+	return new Promise((resolve, reject) => {
+		const ws = new WebSocket(wsUrl, { perMessageDeflate: false });
+		const timer = setTimeout(() => {
+			ws.terminate();
+			reject(new Error("timeout"));
+		}, TIMEOUT);
+		ws.once("open", () => {
+			clearTimeout(timer);
+			resolve(new CDPClient(ws));
+		});
+		ws.once("error", (e) => {
+			clearTimeout(timer);
+			reject(e);
+		});
+	});
+}
@@ -4,7 +4,8 @@
 set -e
 
 OLDMBP_HOST="oldmbp.lnet"
-OLDMBP_IP=$(dig +short $OLDMBP_HOST | head -1)
+OLDMBP_IP=$(dig +short $OLDMBP_HOST || true)
+OLDMBP_IP=${OLDMBP_IP%%$'\n'*}
 
 if [ -z "$OLDMBP_IP" ]; then
     echo "Error: Could not resolve $OLDMBP_HOST"
@@ -13,40 +14,114 @@ fi
 
 echo "Using Chrome at $OLDMBP_HOST ($OLDMBP_IP:9222)"
 
+# Share one authenticated SSH connection across invocations. The master is
+# opened on first use and lingers for ControlPersist, so later commands only
+# open a new session on it instead of doing a full handshake.
+SSH_CONTROL_PATH="$HOME/.ssh/cm-%r@%h:%p"
+SSH_OPTS=(-o ControlMaster=auto -o "ControlPath=$SSH_CONTROL_PATH" -o ControlPersist=10m)
+
+remote() {
+    ssh "${SSH_OPTS[@]}" $OLDMBP_HOST "$@"
+}
+
 # Base directory for browser-tools
 BROWSER_TOOLS_DIR="$HOME/.pi/agent/skills/pi-skills/browser-tools"
 
 # Function to get browser WebSocket URL
 get_ws_url() {
-    curl -s "http://$OLDMBP_IP:9222/json/version" | grep -o '"webSocketDebuggerUrl": "[^"]*"' | cut -d'"' -f4
+    curl -s "http://$OLDMBP_IP:9222/json/version" | jq -r '.webSocketDebuggerUrl'
+}
+
+# Readiness probe for polling. It needs a real DevTools reply: socat accepts
+# TCP connections on the port even while Chrome is down. The fetched payload
+# is kept in VERSION so no second request is needed once Chrome is up.
+fetch_version() {
+    VERSION=$(curl -s --max-time 2 "http://$OLDMBP_IP:9222/json/version") && [ -n "$VERSION" ]
+}
+
+# Retry a command with exponential backoff until it succeeds or the timeout
+# (in seconds) passes. Delays start at 50ms and grow 1.7x up to 1s, so a fast
+# start is noticed almost immediately instead of after a fixed sleep.
+wait_until() {
+    local timeout=$1
+    shift
+    local delay_ms=50
+    local deadline=$((SECONDS + timeout))
+    until "$@"; do
+        if [ $SECONDS -ge $deadline ]; then
+            return 1
+        fi
+        sleep "$(printf '%d.%03d' $((delay_ms / 1000)) $((delay_ms % 1000)))"
+        delay_ms=$((delay_ms * 17 / 10))
+        if [ $delay_ms -gt 1000 ]; then
+            delay_ms=1000
+        fi
+    done
+}
+
+# Run all remote-side status probes in one SSH session. Output sections are
+# separated by a "---" line: Chrome process state, then launchctl entries.
+# pgrep -x matches Chrome's exact process name, not command lines.
+probe_remote() {
+    remote 'pgrep -xq "Google Chrome" && echo running || echo "not running"; echo ---; launchctl list | grep chrome'
 }
 
+# Quit Chrome in one SSH session: ask it to quit, wait up to ~6s for it to
+# exit, then fall back to SIGKILL. Prints GRACEFUL, FORCED or STILL.
+# The quit AppleScript is compiled once and cached on the remote, so later
+# stops run the compiled script instead of parsing the source again.
+STOP_CHROME='QUIT_SCRIPT=~/.cache/chrome_quit.scpt
+[ -f $QUIT_SCRIPT ] || { mkdir -p ~/.cache && osacompile -o $QUIT_SCRIPT -e "tell application \"Google Chrome\" to quit"; } >/dev/null 2>&1
+osascript $QUIT_SCRIPT >/dev/null 2>&1 || osascript -e "tell application \"Google Chrome\" to quit" >/dev/null 2>&1
+for i in $(seq 1 20); do
+    pgrep -xq "Google Chrome" || { echo GRACEFUL; exit 0; }
+    sleep 0.3
+done
+pkill -9 "Google Chrome" 2>/dev/null
+sleep 1
+pgrep -xq "Google Chrome" && { echo STILL; exit 2; }
+echo FORCED'
+
 case "${1:-}" in
     start)
         echo "Starting Chrome on oldmbp.lnet..."
-        ssh $OLDMBP_HOST 'touch /tmp/start-chrome'
-        sleep 3
-        echo "Chrome should be running. Testing..."
-        curl -s "http://$OLDMBP_IP:9222/json/version" | jq -r '.Browser' 2>/dev/null || echo "Chrome not responding yet"
+        remote 'touch /tmp/start-chrome'
+        echo "Waiting for Chrome to respond..."
+        if wait_until 20 fetch_version; then
+            jq -r '.Browser' <<< "$VERSION" 2>/dev/null
+        else
+            echo "Chrome not responding yet"
+        fi
         ;;
     stop)
         echo "Stopping Chrome on oldmbp.lnet..."
-        ssh $OLDMBP_HOST 'pkill -9 "Google Chrome" 2>/dev/null || true'
-        echo "Chrome stopped"
+        case "$(remote "$STOP_CHROME" 2>/dev/null || true)" in
+            GRACEFUL) echo "Chrome stopped" ;;
+            FORCED) echo "Chrome stopped (force killed after it did not quit)" ;;
+            *)
+                echo "Chrome may still be running"
+                exit 1
+                ;;
+        esac
         ;;
     status)
         echo "Checking Chrome status..."
-        if curl -s "http://$OLDMBP_IP:9222/json/version" > /dev/null 2>&1; then
+        if VERSION=$(curl -s "http://$OLDMBP_IP:9222/json/version" 2>/dev/null) && [ -n "$VERSION" ]; then
             echo "✅ Chrome is running"
-            VERSION=$(curl -s "http://$OLDMBP_IP:9222/json/version")
-            BROWSER=$(echo "$VERSION" | jq -r '.Browser')
-            PROTOCOL=$(echo "$VERSION" | jq -r '.["Protocol-Version"]')
-            echo "Browser: $BROWSER, Protocol: $PROTOCOL"
-            echo "WebSocket: $(get_ws_url)"
+            jq -r '"Browser: \(.Browser), Protocol: \(.["Protocol-Version"])", "WebSocket: \(.webSocketDebuggerUrl)"' <<< "$VERSION"
         else
             echo "❌ Chrome not responding"
+            PROBE=$(probe_remote 2>/dev/null || true)
+            PROCESS=${PROBE%%$'\n'---*}
+            SERVICE=${PROBE#*---}
+            SERVICE=${SERVICE#$'\n'}
+            echo "Chrome process: ${PROCESS:-unknown}"
             echo "Launchctl status:"
-            ssh $OLDMBP_HOST 'launchctl list | grep chrome' 2>/dev/null || echo "  Service not loaded"
+            if [ -n "$SERVICE" ]; then
+                echo "$SERVICE"
+            else
+                echo "  Service not loaded"
+            fi
         fi
         ;;
     ws|websocket)
@@ -55,6 +130,31 @@ case "${1:-}" in
     ip)
         echo "$OLDMBP_IP"
         ;;
+    tunnel)
+        # Piggyback the forward on the shared master connection instead of
+        # running a separate long-lived "ssh -N -L" process
+        LOCAL_PORT="${2:-9222}"
+        remote true
+        ssh "${SSH_OPTS[@]}" -O forward -L "$LOCAL_PORT:localhost:9222" $OLDMBP_HOST
+        echo "Forwarding localhost:$LOCAL_PORT -> $OLDMBP_HOST:9222"
+        ;;
+    untunnel)
+        LOCAL_PORT="${2:-9222}"
+        if ssh "${SSH_OPTS[@]}" -O cancel -L "$LOCAL_PORT:localhost:9222" $OLDMBP_HOST; then
+            echo "Stopped forwarding localhost:$LOCAL_PORT"
+        else
+            echo "Error: Could not stop forwarding localhost:$LOCAL_PORT"
+            exit 1
+        fi
+        ;;
+    disconnect)
+        if ssh "${SSH_OPTS[@]}" -O exit $OLDMBP_HOST; then
+            echo "SSH master connection closed"
+        else
+            echo "Error: Could not close the shared SSH connection"
+            exit 1
+        fi
+        ;;
     *)
         cat << 'EOF'
 Usage: oldmbp-browser.sh <command> [args]
@@ -65,6 +165,9 @@ Commands:
   status             Check Chrome status and CDP endpoint
   ws                 Show WebSocket URL for CDP connection
   ip                 Show resolved IP address
+  tunnel [port]      Forward localhost:<port> (default 9222) to Chrome over SSH
+  untunnel [port]    Stop forwarding localhost:<port>
+  disconnect         Close the shared SSH master connection
 
 EOF
         ;;
@@ -1,6 +1,7 @@
 #!/usr/bin/env node
 
 import puppeteer from "puppeteer-core";
+import { activePage, invalidateTargets } from "./cdp.js";
 import { Readability } from "@mozilla/readability";
 import { JSDOM } from "jsdom";
 import TurndownService from "turndown";
@@ -38,7 +39,7 @@ const b = await Promise.race([
 	process.exit(1);
 });
 
-const p = (await b.pages()).at(-1);
+const p = await activePage(b);
 if (!p) {
 	console.error("✗ No active tab found");
 	process.exit(1);
@@ -48,6 +49,7 @@ await Promise.race([
 	p.goto(url, { waitUntil: "networkidle2" }),
 	new Promise((r) => setTimeout(r, 10000)),
 ]).catch(() => {});
+invalidateTargets();
 
 // Get HTML via CDP (works even with TrustedScriptURL restrictions)
 const client = await p.createCDPSession();
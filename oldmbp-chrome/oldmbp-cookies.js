@@ -1,6 +1,7 @@
 #!/usr/bin/env node
 
 import puppeteer from "puppeteer-core";
+import { activePage } from "./cdp.js";
 
 const OLDMBP_IP = "192.168.2.4";
 
@@ -16,7 +17,7 @@ const b = await Promise.race([
 	process.exit(1);
 });
 
-const p = (await b.pages()).at(-1);
+const p = await activePage(b);
 
 if (!p) {
 	console.error("✗ No active tab found");
@@ -1,55 +1,120 @@
 #!/usr/bin/env node
 
-import puppeteer from "puppeteer-core";
+import { createInterface } from "node:readline";
+import { inspect } from "node:util";
+import { activeTab, connect, connectActiveTab, invalidateTargets, pageWebSocketUrl } from "./cdp.js";
 
-const code = process.argv.slice(2).join(" ");
-if (!code) {
+const args = process.argv.slice(2);
+const worker = args.includes("--worker");
+const code = args.filter((a) => a !== "--worker").join(" ");
+if (!code && !worker) {
 	console.log("Usage: oldmbp-eval.js 'code'");
+	console.log("       oldmbp-eval.js --worker");
 	console.log("\nExamples:");
 	console.log('  oldmbp-eval.js "document.title"');
 	console.log('  oldmbp-eval.js "document.querySelectorAll(\'a\').length"');
+	console.log("\nWorker mode keeps one connection open and reads one JSON request per line");
+	console.log('from stdin: {"id": 1, "expression": "document.title", "targetId": "..."}');
+	console.log('Replies are written one per line: {"id": 1, "value": ...} or {"id": 1, "error": "..."}');
 	process.exit(1);
 }
 
-const OLDMBP_IP = "192.168.2.4";
+// Values JSON can't represent (NaN, ±Infinity, -0, BigInt) are formatted as
+// strings the way console.log shows them, e.g. "NaN", "-0" or "10n"
+const unserializable = (v) =>
+	typeof v === "bigint" || (typeof v === "number" && (!Number.isFinite(v) || Object.is(v, -0)));
 
-const b = await Promise.race([
-	puppeteer.connect({
-		browserURL: `http://${OLDMBP_IP}:9222`,
-		defaultViewport: null,
-	}),
-	new Promise((_, reject) => setTimeout(() => reject(new Error("timeout")), 5000)),
-]).catch((e) => {
+if (worker) {
+	// One WebSocket per tab, reused for as long as it stays open
+	const clientsByTarget = new Map();
+
+	const clientFor = async (targetId) => {
+		if (targetId) {
+			const cached = clientsByTarget.get(targetId);
+			if (cached?.open) return cached;
+			// A tab's WebSocket URL follows from its id, so no /json/list lookup is needed
+			const client = await connect(pageWebSocketUrl(targetId)).catch((e) => {
+				invalidateTargets();
+				throw new Error(`Could not connect to tab ${targetId}: ${e.message}`);
+			});
+			clientsByTarget.set(targetId, client);
+			return client;
+		}
+		const active = await activeTab();
+		if (!active) throw new Error("No active tab found");
+		const cached = clientsByTarget.get(active.id);
+		if (cached?.open) return cached;
+		const { tab, client } = await connectActiveTab(active).catch((e) => {
+			throw new Error(`Could not connect to the active tab: ${e.message}`);
+		});
+		clientsByTarget.set(tab.id, client);
+		return client;
+	};
+
+	const reply = (msg) => process.stdout.write(JSON.stringify(msg) + "\n");
+
+	for await (const line of createInterface({ input: process.stdin, crlfDelay: Infinity })) {
+		if (!line.trim()) continue;
+		let id = null;
+		try {
+			const req = JSON.parse(line);
+			id = req.id ?? null;
+			const client = await clientFor(req.targetId);
+			const value = await client.evaluate(req.expression);
+			reply({ id, value: unserializable(value) ? inspect(value) : (value ?? null) });
+		} catch (e) {
+			reply({ id, error: e.message });
+		}
+	}
+
+	for (const client of clientsByTarget.values()) client.close();
+	// Replies may still be queued for a slow reader; flush them before exiting
+	await new Promise((resolve) => process.stdout.end(resolve));
+	process.exit(0);
+}
+
+const tab = await activeTab().catch((e) => {
 	console.error("✗ Could not connect to browser:", e.message);
 	console.error("  Run: oldmbp-browser.sh start");
 	process.exit(1);
 });
 
-const p = (await b.pages()).at(-1);
-
-if (!p) {
+if (!tab) {
 	console.error("✗ No active tab found");
 	process.exit(1);
 }
 
-const result = await p.evaluate((c) => {
-	const AsyncFunction = (async () => {}).constructor;
-	return new AsyncFunction(`return (${c})`)();
-}, code);
+const { client } = await connectActiveTab(tab).catch((e) => {
+	console.error("✗ Could not connect to tab:", e.message);
+	process.exit(1);
+});
+
+const result = await client.evaluate(code).catch((e) => {
+	console.error("✗", e.message);
+	process.exit(1);
+});
 
-if (Array.isArray(result)) {
-	for (let i = 0; i < result.length; i++) {
-		if (i > 0) console.log("");
-		for (const [key, value] of Object.entries(result[i])) {
-			console.log(`${key}: ${value}`);
+if (typeof result !== "object" || result === null) {
+	// Plain values (often large strings such as outerHTML) are written as-is,
+	// without copying them into a joined output buffer first
+	process.stdout.write(unserializable(result) ? inspect(result) : String(result));
+	process.stdout.write("\n");
+} else {
+	// Assemble key/value output first so it goes out in a single write
+	const lines = [];
+	if (Array.isArray(result)) {
+		for (let i = 0; i < result.length; i++) {
+			if (i > 0) lines.push("");
+			for (const [key, value] of Object.entries(result[i])) {
+				lines.push(`${key}: ${value}`);
+			}
+		}
+	} else {
+		for (const [key, value] of Object.entries(result)) {
+			lines.push(`${key}: ${value}`);
 		}
 	}
-} else if (typeof result === "object" && result !== null) {
-	for (const [key, value] of Object.entries(result)) {
-		console.log(`${key}: ${value}`);
-	}
-} else {
-	console.log(result);
+	if (lines.length) process.stdout.write(lines.join("\n") + "\n");
 }
 
-await b.disconnect();
+client.close();
@@ -1,6 +1,7 @@
 #!/usr/bin/env node
 
 import puppeteer from "puppeteer-core";
+import { activePage, invalidateTargets } from "./cdp.js";
 
 const args = process.argv.slice(2);
 const newTab = args.includes("--new");
@@ -35,7 +36,11 @@ if (newTab) {
 	await p.goto(url, { waitUntil: "domcontentloaded" });
 	console.log("✓ Opened:", url);
 } else {
-	const p = (await b.pages()).at(-1);
+	const p = await activePage(b);
+	if (!p) {
+		console.error("✗ No active tab found");
+		process.exit(1);
+	}
 	await p.goto(url, { waitUntil: "domcontentloaded" });
 	if (reload) {
 		await p.reload({ waitUntil: "domcontentloaded" });
@@ -43,4 +48,5 @@ if (newTab) {
 	console.log("✓ Navigated to:", url);
 }
 
+invalidateTargets();
 await b.disconnect();
@@ -1,6 +1,7 @@
 #!/usr/bin/env node
 
 import puppeteer from "puppeteer-core";
+import { activePage } from "./cdp.js";
 
 const message = process.argv.slice(2).join(" ");
 if (!message) {
@@ -24,7 +25,7 @@ const b = await Promise.race([
 	process.exit(1);
 });
 
-const p = (await b.pages()).at(-1);
+const p = await activePage(b);
 
 if (!p) {
 	console.error("✗ No active tab found");
@@ -3,6 +3,7 @@
 import { tmpdir } from "node:os";
 import { join } from "node:path";
 import puppeteer from "puppeteer-core";
+import { activePage } from "./cdp.js";
 
 const OLDMBP_IP = "192.168.2.4";
 
@@ -18,7 +19,7 @@ const b = await Promise.race([
 	process.exit(1);
 });
 
-const p = (await b.pages()).at(-1);
+const p = await activePage(b);
 
 if (!p) {
 	console.error("✗ No active tab found");
@@ -0,0 +1,75 @@
+#!/usr/bin/env node
+
+import { activateTab, closeTab, closeTabs, listTargets, openTab } from "./cdp.js";
+
+const [command, ...args] = process.argv.slice(2);
+
+if (!["list", "open", "activate", "close"].includes(command)) {
+	console.log("Usage: oldmbp-tabs.js list");
+	console.log("       oldmbp-tabs.js open <url>");
+	console.log("       oldmbp-tabs.js activate <id>");
+	console.log("       oldmbp-tabs.js close <id> [id...]");
+	console.log("       oldmbp-tabs.js close --all");
+	console.log("\nExamples:");
+	console.log("  oldmbp-tabs.js list          # List open tabs, most recently active first");
+	console.log("  oldmbp-tabs.js open https://example.com");
+	console.log("  oldmbp-tabs.js close --all   # Close every tab except the active one");
+	process.exit(1);
+}
+
+const fail = (e) => {
+	console.error("✗ Could not connect to browser:", e.message);
+	console.error("  Run: oldmbp-browser.sh start");
+	process.exit(1);
+};
+
+const pages = () => listTargets({ type: "page" }).catch(fail);
+
+if (command === "list") {
+	const tabs = await pages();
+	for (let i = 0; i < tabs.length; i++) {
+		if (i > 0) console.log("");
+		console.log(`id: ${tabs[i].id}`);
+		console.log(`title: ${tabs[i].title}`);
+		console.log(`url: ${tabs[i].url}`);
+	}
+	process.exit(0);
+}
+
+if (command === "open" || command === "activate") {
+	if (!args[0]) {
+		console.error(`✗ No ${command === "open" ? "url" : "tab id"} given`);
+		process.exit(1);
+	}
+	const result = await (command === "open" ? openTab : activateTab)(args[0]).catch((e) => {
+		console.error(`✗ Could not ${command} ${args[0]}:`, e.message);
+		process.exit(1);
+	});
+	console.log(command === "open" ? `✓ Opened: ${result.id}` : `✓ Activated: ${args[0]}`);
+	process.exit(0);
+}
+
+if (args.includes("--all")) {
+	// Keep the active tab so the other tools still have a page to work with
+	const ids = (await pages()).slice(1).map((t) => t.id);
+	const results = await closeTabs(ids);
+	const failed = results.filter((r) => r.status === "rejected");
+	console.log(`✓ Closed ${ids.length - failed.length} of ${ids.length} tabs`);
+	for (const r of failed) console.error("✗", r.reason.message);
+	process.exit(failed.length ? 1 : 0);
+}
+
+if (!args.length) {
+	console.error("✗ No tab id given");
+	process.exit(1);
+}
+
+for (const id of args) {
+	await closeTab(id).then(
+		() => console.log("✓ Closed:", id),
+		(e) => {
+			console.error(`✗ Could not close ${id}:`, e.message);
+			process.exitCode = 1;
+		},
+	);
+}